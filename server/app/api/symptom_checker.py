@@ -2,9 +2,19 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List, Optional
 from app.services.symptom_analysis import analyze_symptoms, identify_abnormality, symptom_checker
+from app.services.diagnosis_table import load_diagnosis_table
+from app.core.config import settings
 
 router = APIRouter()
 
+# Precomputed outcomes for the deterministic rule endpoints (None if not built)
+diagnosis_table = load_diagnosis_table(settings.diagnosis_table_path)
+
+def lookup_outcome(name, input_data):
+    if diagnosis_table is None:
+        return None
+    return diagnosis_table.lookup(name, input_data.cycle_length, input_data.cycle_duration, input_data.symptoms)
+
 class SymptomInput(BaseModel):
     symptoms: List[str]
     cycle_length: int
@@ -38,8 +48,10 @@ async def analyze_symptoms_endpoint(symptom_input: SymptomInput):
 @router.post("/check", response_model=CheckerOutput)
 async def check_symptoms(input_data: SymptomInput):
     try:
-        # Call function to check symptoms using Modus API framework
-        result = symptom_checker(input_data.cycle_length, input_data.cycle_duration, input_data.symptoms)
+        result = lookup_outcome("check", input_data)
+        if result is None:
+            # Call function to check symptoms using Modus API framework
+            result = symptom_checker(input_data.cycle_length, input_data.cycle_duration, input_data.symptoms)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -47,12 +59,14 @@ async def check_symptoms(input_data: SymptomInput):
 @router.post("/identify", response_model=AbnormalityOutput)
 async def identify_abnormalities(input_data: SymptomInput):
     try:
-        # Call function to identify abnormalities using Modus API framework
-        result = identify_abnormality(
-            input_data.cycle_length, 
-            input_data.cycle_duration, 
-            input_data.symptoms
-        )
+        result = lookup_outcome("identify", input_data)
+        if result is None:
+            # Call function to identify abnormalities using Modus API framework
+            result = identify_abnormality(
+                input_data.cycle_length, 
+                input_data.cycle_duration, 
+                input_data.symptoms
+            )
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
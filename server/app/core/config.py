@@ -1,4 +1,5 @@
 # App configuration settings\n# TODO: Add configuration values (e.g., database URL, API keys)
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -7,6 +8,7 @@ class Settings(BaseSettings):
     neo4j_password: str
     jwt_secret_key: str
     jwt_algorithm: str = "HS256"
+    diagnosis_table_path: Optional[str] = None
 
     class Config:
         env_file = "/Users/jeevangowda/Desktop/projects/Dottie/.env"
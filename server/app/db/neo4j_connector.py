@@ -14,6 +14,15 @@ class Neo4jConnector:
     Includes methods for creating nodes, relationships, querying data, and clearing the database.
     """
 
+    REQUIRED_FIELDS = {
+        "Symptom": ["name"],
+        "Condition": ["name", "severity", "action"],
+        "NormalRange": ["name", "min", "max", "unit"],
+        "EducationalContent": ["type", "url", "title", "source"],
+        "Cause": ["name"],
+        "Abnormality": ["description"]
+    }
+
     def __init__(self):
         """
         Initialize the Neo4j driver with database credentials.
@@ -40,22 +49,20 @@ class Neo4jConnector:
         Raises:
         - ValueError: If required fields for the node type are missing.
         """
-        required_fields = {
-            "Symptom": ["name"],
-            "Condition": ["name", "severity", "action"],
-            "NormalRange": ["name", "min", "max", "unit"],
-            "EducationalContent": ["type", "url", "title", "source"],
-            "Cause": ["name"],
-            "Abnormality": ["description"]
-        }
-        if label in required_fields:
-            missing_fields = [field for field in required_fields[label] if field not in properties]
-            if missing_fields:
-                raise ValueError(f"Missing required fields for {label}: {', '.join(missing_fields)}")
+        self._validate_properties(label, properties)
 
         with self.driver.session() as session:
             session.execute_write(self._create_node, label, properties)
 
+    def _validate_properties(self, label, properties):
+        """
+        Check that the properties include the required fields for the node type.
+        """
+        if label in self.REQUIRED_FIELDS:
+            missing_fields = [field for field in self.REQUIRED_FIELDS[label] if field not in properties]
+            if missing_fields:
+                raise ValueError(f"Missing required fields for {label}: {', '.join(missing_fields)}")
+
     @staticmethod
     def _create_node(tx, label, properties):
         """
@@ -68,6 +75,38 @@ class Neo4jConnector:
         """
         tx.run(query, **properties)
 
+    def merge_nodes(self, label, key, rows):
+        """
+        Create or update many nodes in a single transaction, matching existing nodes on a key property.
+
+        Args:
+        - label (str): The label of the nodes (e.g., 'EducationalContent').
+        - key (str): Property used to match existing nodes (e.g., 'url').
+        - rows (list): Node attributes as a list of dicts.
+
+        Raises:
+        - ValueError: If required fields for the node type are missing.
+        """
+        for properties in rows:
+            self._validate_properties(label, properties)
+            if key not in properties:
+                raise ValueError(f"Missing merge key for {label}: {key}")
+
+        with self.driver.session() as session:
+            session.execute_write(self._merge_nodes, label, key, rows)
+
+    @staticmethod
+    def _merge_nodes(tx, label, key, rows):
+        """
+        Transaction method to merge a batch of nodes in the database.
+        """
+        query = f"""
+        UNWIND $rows AS row
+        MERGE (n:{label} {{{key}: row.{key}}})
+        SET n += row
+        """
+        tx.run(query, rows=rows)
+
     def create_relationship(self, from_node_label, from_node_properties, to_node_label, to_node_properties, relationship, properties=None):
         """
         Create a relationship between two nodes.
@@ -0,0 +1,314 @@
+### **diagnosis_table.py**
+import os
+import sys
+import json
+import array
+import copy
+import mmap
+import struct
+import hashlib
+import inspect
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the file layout, clamping ranges or vocabulary change
+TABLE_VERSION = 1
+MAGIC = b"DOTTIEDX"
+HEADER = struct.Struct("<8sHI")
+
+DEFAULT_TABLE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "data", "diagnosis_table.bin"
+)
+
+# Clinically meaningful input ranges (days). Values outside are clamped to the bounds.
+CYCLE_LENGTH_RANGE = (0, 90)
+CYCLE_DURATION_RANGE = (0, 15)
+
+# Known symptoms, encoded as a bitset. Inputs with other symptoms are not covered by the table.
+SYMPTOM_VOCABULARY = (
+    "heavy bleeding",
+    "cramps",
+    "Dysmenorrhea",
+    "Menstrual Migraine",
+)
+
+
+def default_rules():
+    """
+    The deterministic rule functions served from the table, keyed by table name.
+    """
+    from app.services.symptom_analysis import symptom_checker, identify_abnormality
+
+    return {"check": symptom_checker, "identify": identify_abnormality}
+
+
+def rules_fingerprint(rules, vocabulary=SYMPTOM_VOCABULARY,
+                      cycle_length_range=CYCLE_LENGTH_RANGE, cycle_duration_range=CYCLE_DURATION_RANGE):
+    """
+    Hash the rule sources, vocabulary and clamping ranges, so a table built
+    from different rules is never served.
+    """
+    payload = {
+        "rules": {name: inspect.getsource(rule) for name, rule in rules.items()},
+        "vocabulary": list(vocabulary),
+        "cycle_length_range": list(cycle_length_range),
+        "cycle_duration_range": list(cycle_duration_range),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _clamp(value, bounds):
+    return max(bounds[0], min(bounds[1], value))
+
+
+class DiagnosisTable:
+    """
+    Precomputed outcomes of the deterministic symptom rules.
+
+    Every (cycle_length, cycle_duration, symptom-set) input is mapped to one integer
+    index; each named table stores one interned outcome ID per index.
+    """
+
+    def __init__(self, tables, outcomes, cycle_length_range=CYCLE_LENGTH_RANGE,
+                 cycle_duration_range=CYCLE_DURATION_RANGE, vocabulary=SYMPTOM_VOCABULARY, fingerprint=None):
+        """
+        Args:
+        - tables (dict): Table name -> sequence of outcome IDs (bytes, array or memoryview).
+        - outcomes (dict): Table name -> list of interned outcome dicts.
+        - fingerprint (str): `rules_fingerprint` of the rules the table was built from.
+        """
+        self.fingerprint = fingerprint
+        self.tables = tables
+        self.outcomes = outcomes
+        self.cycle_length_range = tuple(cycle_length_range)
+        self.cycle_duration_range = tuple(cycle_duration_range)
+        self.vocabulary = tuple(vocabulary)
+        self.symptom_bits = {symptom: 1 << i for i, symptom in enumerate(self.vocabulary)}
+        self.durations = self.cycle_duration_range[1] - self.cycle_duration_range[0] + 1
+        self.masks = 1 << len(self.vocabulary)
+        self.size = (self.cycle_length_range[1] - self.cycle_length_range[0] + 1) * self.durations * self.masks
+        self._mmap = None
+
+    def encode_symptoms(self, symptoms):
+        """
+        Return the bitset for a list of symptoms, or None if any symptom is not in the vocabulary.
+        """
+        mask = 0
+        for symptom in symptoms:
+            bit = self.symptom_bits.get(symptom)
+            if bit is None:
+                return None
+            mask |= bit
+        return mask
+
+    def index(self, cycle_length, cycle_duration, mask):
+        length = _clamp(cycle_length, self.cycle_length_range) - self.cycle_length_range[0]
+        duration = _clamp(cycle_duration, self.cycle_duration_range) - self.cycle_duration_range[0]
+        return (length * self.durations + duration) * self.masks + mask
+
+    def lookup(self, name, cycle_length, cycle_duration, symptoms):
+        """
+        Return a copy of the precomputed outcome, or None if the input is not covered by the table.
+        """
+        mask = self.encode_symptoms(symptoms)
+        if mask is None:
+            return None
+        outcome_id = self.tables[name][self.index(cycle_length, cycle_duration, mask)]
+        # Outcomes are shared by every input that maps to them; never hand out the interned object
+        return copy.deepcopy(self.outcomes[name][outcome_id])
+
+    def inputs(self):
+        """
+        Yield every (cycle_length, cycle_duration, symptoms, index) covered by the table.
+        """
+        for cycle_length in range(self.cycle_length_range[0], self.cycle_length_range[1] + 1):
+            for cycle_duration in range(self.cycle_duration_range[0], self.cycle_duration_range[1] + 1):
+                for mask in range(self.masks):
+                    symptoms = [s for s in self.vocabulary if mask & self.symptom_bits[s]]
+                    yield cycle_length, cycle_duration, symptoms, self.index(cycle_length, cycle_duration, mask)
+
+    def save(self, path):
+        """
+        Write the table to a versioned binary file: a fixed header, a JSON
+        metadata block, then one uint8 or little-endian uint16 outcome ID
+        array per table.
+        """
+        names = sorted(self.tables)
+        metadata = {
+            "fingerprint": self.fingerprint,
+            "cycle_length_range": self.cycle_length_range,
+            "cycle_duration_range": self.cycle_duration_range,
+            "vocabulary": self.vocabulary,
+            "tables": [
+                {
+                    "name": name,
+                    "width": 1 if len(self.outcomes[name]) <= 256 else 2,
+                    "outcomes": self.outcomes[name],
+                }
+                for name in names
+            ],
+        }
+        encoded = json.dumps(metadata, sort_keys=True).encode("utf-8")
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, TABLE_VERSION, len(encoded)))
+            f.write(encoded)
+            for entry in metadata["tables"]:
+                fmt = "<%dB" if entry["width"] == 1 else "<%dH"
+                f.write(struct.pack(fmt % self.size, *self.tables[entry["name"]]))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Memory-map a table file written by `save`.
+
+        Raises:
+        - ValueError: If the file is not a diagnosis table, has a different version or is truncated.
+        """
+        if os.path.getsize(path) < HEADER.size:
+            raise ValueError(f"{path} is too short to be a diagnosis table")
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            table = cls._from_buffer(mapped, path)
+        except Exception:
+            mapped.close()
+            raise
+        table._mmap = mapped
+        return table
+
+    @classmethod
+    def _from_buffer(cls, mapped, path):
+        magic, version, metadata_length = HEADER.unpack_from(mapped, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a diagnosis table")
+        if version != TABLE_VERSION:
+            raise ValueError(f"Diagnosis table version {version} does not match expected version {TABLE_VERSION}")
+
+        offset = HEADER.size + metadata_length
+        try:
+            metadata = json.loads(mapped[HEADER.size:offset].decode("utf-8"))
+            table = cls(
+                {}, {}, metadata["cycle_length_range"], metadata["cycle_duration_range"],
+                metadata["vocabulary"], metadata["fingerprint"]
+            )
+            entries = [(entry["name"], entry["width"], entry["outcomes"]) for entry in metadata["tables"]]
+            for name, width, _ in entries:
+                if width not in (1, 2):
+                    raise ValueError(f"unsupported outcome ID width {width!r} for table {name}")
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"{path} has invalid diagnosis table metadata: {e}") from e
+
+        expected_size = offset + sum(table.size * width for _, width, _ in entries)
+        if len(mapped) != expected_size:
+            raise ValueError(f"{path} is {len(mapped)} bytes, expected {expected_size}; rebuild the table")
+
+        view = memoryview(mapped)
+        for name, width, outcomes in entries:
+            length = table.size * width
+            data = view[offset:offset + length]
+            if width == 1:
+                table.tables[name] = data
+            elif sys.byteorder == "little":
+                table.tables[name] = data.cast("H")
+            else:
+                # Arrays are stored little-endian; swap into a native copy on big-endian hosts
+                ids = array.array("H", data.tobytes())
+                ids.byteswap()
+                table.tables[name] = ids
+            table.outcomes[name] = outcomes
+            offset += length
+        return table
+
+
+def build_diagnosis_table(rules=None):
+    """
+    Evaluate the rule functions over every covered input and intern the outcomes.
+
+    Args:
+    - rules (dict): Table name -> rule function taking (cycle_length, cycle_duration, symptoms).
+      Defaults to `default_rules()`.
+    """
+    rules = rules or default_rules()
+    table = DiagnosisTable({}, {}, fingerprint=rules_fingerprint(rules))
+    for name, rule in rules.items():
+        ids = [0] * table.size
+        interned = {}
+        outcomes = []
+        for cycle_length, cycle_duration, symptoms, index in table.inputs():
+            outcome = rule(cycle_length, cycle_duration, symptoms)
+            key = json.dumps(outcome, sort_keys=True)
+            if key not in interned:
+                interned[key] = len(outcomes)
+                outcomes.append(outcome)
+            ids[index] = interned[key]
+        if len(outcomes) > 65536:
+            raise ValueError(f"Too many distinct outcomes for table {name}: {len(outcomes)}")
+        table.tables[name] = ids
+        table.outcomes[name] = outcomes
+    return table
+
+
+def verify_diagnosis_table(table, rules=None):
+    """
+    Cross-check the table against the live rule functions, including inputs
+    outside the clamped ranges.
+
+    Returns:
+    - list: Mismatches as (name, cycle_length, cycle_duration, symptoms, expected, actual) tuples.
+    """
+    rules = rules or default_rules()
+    length_min, length_max = table.cycle_length_range
+    duration_min, duration_max = table.cycle_duration_range
+    probes = [
+        (cycle_length, cycle_duration, symptoms)
+        for cycle_length, cycle_duration, symptoms, _ in table.inputs()
+    ]
+    for mask in range(table.masks):
+        symptoms = [s for s in table.vocabulary if mask & table.symptom_bits[s]]
+        for cycle_length in (length_min - 1, length_max + 1, length_max * 2):
+            for cycle_duration in (duration_min - 1, duration_min, duration_max, duration_max + 1, duration_max * 2):
+                probes.append((cycle_length, cycle_duration, symptoms))
+        for cycle_duration in (duration_min - 1, duration_max + 1, duration_max * 2):
+            probes.append((length_min, cycle_duration, symptoms))
+
+    mismatches = []
+    for name, rule in rules.items():
+        for cycle_length, cycle_duration, symptoms in probes:
+            expected = rule(cycle_length, cycle_duration, symptoms)
+            actual = table.lookup(name, cycle_length, cycle_duration, symptoms)
+            if expected != actual:
+                mismatches.append((name, cycle_length, cycle_duration, symptoms, expected, actual))
+    return mismatches
+
+
+def load_diagnosis_table(path=None, rules=None):
+    """
+    Load the precomputed table if it has been built from the current rules,
+    otherwise return None so callers fall back to the live rules.
+    """
+    path = path or DEFAULT_TABLE_PATH
+    if not os.path.exists(path):
+        return None
+    try:
+        table = DiagnosisTable.load(path)
+    except ValueError as e:
+        logger.error("Could not load diagnosis table: %s. Using live rules.", e)
+        return None
+    try:
+        expected = rules_fingerprint(rules or default_rules())
+    except OSError as e:
+        logger.error("Could not fingerprint the diagnosis rules: %s. Using live rules.", e)
+        return None
+    if table.fingerprint != expected:
+        logger.warning("Diagnosis table %s was built from different rules; rebuild it. Using live rules.", path)
+        return None
+    return table
@@ -0,0 +1,87 @@
+from app.services.diagnosis_table import (
+    DiagnosisTable,
+    build_diagnosis_table,
+    load_diagnosis_table,
+    verify_diagnosis_table,
+)
+
+
+def menorrhagia_rule(cycle_length, cycle_duration, symptoms):
+    if "heavy bleeding" in symptoms and cycle_duration > 7:
+        return {
+            "status": "Abnormal",
+            "abnormalities": ["Menorrhagia"],
+            "recommendation": "Consult a healthcare provider for further evaluation."
+        }
+    return {"status": "Normal", "abnormalities": [], "recommendation": "No action needed"}
+
+
+def table_rule(cycle_length, cycle_duration, symptoms):
+    return {"status": "Table", "abnormalities": [], "recommendation": f"{cycle_length}/{cycle_duration}"}
+
+
+def duration_rule(cycle_length, cycle_duration, symptoms):
+    # One outcome per (clamped) length and duration, to force uint16 outcome IDs
+    cycle_length = max(0, min(90, cycle_length))
+    cycle_duration = max(0, min(15, cycle_duration))
+    return {"status": "Normal", "abnormalities": [], "recommendation": str(cycle_length * 100 + cycle_duration)}
+
+
+def test_table_round_trip(tmp_path):
+    rules = {"check": menorrhagia_rule}
+    table = build_diagnosis_table(rules)
+    assert len(table.outcomes["check"]) == 2
+
+    path = str(tmp_path / "diagnosis_table.bin")
+    table.save(path)
+    loaded = DiagnosisTable.load(path)
+
+    assert loaded.lookup("check", 28, 9, ["heavy bleeding", "cramps"])["abnormalities"] == ["Menorrhagia"]
+    assert loaded.lookup("check", 28, 100, ["heavy bleeding"])["status"] == "Abnormal"
+    assert loaded.lookup("check", 28, 5, ["heavy bleeding"])["status"] == "Normal"
+    assert loaded.lookup("check", 28, 9, ["unknown symptom"]) is None
+    assert verify_diagnosis_table(loaded, rules) == []
+
+
+def test_verify_detects_stale_table():
+    table = build_diagnosis_table({"check": menorrhagia_rule})
+
+    def stricter_rule(cycle_length, cycle_duration, symptoms):
+        return menorrhagia_rule(cycle_length, cycle_duration - 1, symptoms)
+
+    assert verify_diagnosis_table(table, {"check": stricter_rule})
+
+
+def test_uint16_outcome_ids(tmp_path):
+    rules = {"check": duration_rule}
+    table = build_diagnosis_table(rules)
+    assert len(table.outcomes["check"]) > 256
+
+    path = str(tmp_path / "diagnosis_table.bin")
+    table.save(path)
+    loaded = load_diagnosis_table(path, rules)
+
+    assert loaded.tables["check"].itemsize == 2
+    assert loaded.lookup("check", 50, 3, [])["recommendation"] == "5003"
+    assert verify_diagnosis_table(loaded, rules) == []
+
+
+def test_load_rejects_stale_or_truncated_tables(tmp_path):
+    path = str(tmp_path / "diagnosis_table.bin")
+    build_diagnosis_table({"check": menorrhagia_rule}).save(path)
+    assert load_diagnosis_table(path, {"check": menorrhagia_rule}) is not None
+    assert load_diagnosis_table(path, {"check": table_rule}) is None
+
+    with open(path, "rb") as f:
+        data = f.read()
+    for corrupted in (data[:-1], b"", data.replace(b'"width": 1', b'"width": 3')):
+        with open(path, "wb") as f:
+            f.write(corrupted)
+        assert load_diagnosis_table(path, {"check": menorrhagia_rule}) is None
+
+
+
+def test_lookup_returns_a_copy():
+    table = build_diagnosis_table({"check": menorrhagia_rule})
+    table.lookup("check", 28, 9, ["heavy bleeding"])["abnormalities"].append("Changed")
+    assert table.lookup("check", 30, 10, ["heavy bleeding"])["abnormalities"] == ["Menorrhagia"]
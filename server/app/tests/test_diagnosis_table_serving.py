@@ -0,0 +1,79 @@
+import sys
+import types
+import importlib
+
+import pytest
+
+from app.services.diagnosis_table import build_diagnosis_table, verify_diagnosis_table
+
+
+@pytest.fixture
+def live_modules(monkeypatch, tmp_path):
+    """
+    Import the rule and router modules with their external dependencies
+    (Neo4j, Gemini, settings) stubbed out.
+    """
+    connector = types.ModuleType("app.db.neo4j_connector")
+    connector.Neo4jConnector = lambda: None
+    gemini = types.ModuleType("app.services.gemini_integration")
+    gemini.integrate_with_gemini = None
+    config = types.ModuleType("app.core.config")
+    config.settings = types.SimpleNamespace(diagnosis_table_path=str(tmp_path / "missing.bin"))
+
+    monkeypatch.setitem(sys.modules, "app.db.neo4j_connector", connector)
+    monkeypatch.setitem(sys.modules, "app.services.gemini_integration", gemini)
+    monkeypatch.setitem(sys.modules, "app.core.config", config)
+    for name in ("app.services.symptom_analysis", "app.api.symptom_checker"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    return importlib.import_module("app.services.symptom_analysis")
+
+
+def test_default_rules_match_table(live_modules):
+    table = build_diagnosis_table()
+    assert verify_diagnosis_table(table) == []
+
+
+@pytest.fixture
+def client(live_modules):
+    pytest.importorskip("fastapi")
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    symptom_checker_api = importlib.import_module("app.api.symptom_checker")
+    app = FastAPI()
+    app.include_router(symptom_checker_api.router, prefix="/api/v1/symptoms")
+    return TestClient(app), symptom_checker_api
+
+
+def table_rule(cycle_length, cycle_duration, symptoms):
+    return {"status": "Table", "abnormalities": [], "recommendation": f"{cycle_length}/{cycle_duration}"}
+
+
+def test_endpoints_serve_table(client, monkeypatch):
+    client, symptom_checker_api = client
+    table = build_diagnosis_table({"check": table_rule, "identify": table_rule})
+    monkeypatch.setattr(symptom_checker_api, "diagnosis_table", table)
+    payload = {"symptoms": ["heavy bleeding"], "cycle_length": 28, "cycle_duration": 9, "age": 25}
+
+    for endpoint in ("check", "identify"):
+        response = client.post(f"/api/v1/symptoms/{endpoint}", json=payload)
+        assert response.status_code == 200
+        assert response.json() == {"status": "Table", "abnormalities": [], "recommendation": "28/9"}
+
+
+def test_endpoints_fall_back_to_live_rules(client, monkeypatch):
+    client, symptom_checker_api = client
+    assert symptom_checker_api.diagnosis_table is None
+
+    table = build_diagnosis_table({"check": table_rule, "identify": table_rule})
+    monkeypatch.setattr(symptom_checker_api, "diagnosis_table", table)
+    payload = {"symptoms": ["heavy bleeding", "fatigue"], "cycle_length": 28, "cycle_duration": 9, "age": 25}
+    response = client.post("/api/v1/symptoms/check", json=payload)
+    assert response.json()["abnormalities"] == ["Menorrhagia"]
+
+    monkeypatch.setattr(symptom_checker_api, "diagnosis_table", None)
+    payload["symptoms"] = ["heavy bleeding"]
+    for endpoint in ("check", "identify"):
+        response = client.post(f"/api/v1/symptoms/{endpoint}", json=payload)
+        assert response.status_code == 200
+        assert response.json()["abnormalities"] == ["Menorrhagia"]
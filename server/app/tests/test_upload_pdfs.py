@@ -0,0 +1,134 @@
+import os
+import importlib.util
+
+spec = importlib.util.spec_from_file_location(
+    "upload_pdfs",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "scripts", "upload_pdfs.py")
+)
+upload_pdfs = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(upload_pdfs)
+
+
+class FakeConnector:
+    def __init__(self):
+        self.batches = []
+
+    def merge_nodes(self, label, key, rows):
+        self.batches.append((label, key, rows))
+
+
+class FakeBlob:
+    def __init__(self, name, chunk_size=None, md5_hash=None):
+        self.name = name
+        self.chunk_size = chunk_size
+        self.md5_hash = md5_hash
+        self.uploads = []
+
+    def upload_from_filename(self, filename, content_type=None):
+        self.uploads.append((filename, content_type))
+
+
+class FakeBucket:
+    def __init__(self):
+        self.stored = {}
+        self.blobs = []
+
+    def get_blob(self, name):
+        return self.stored.get(name)
+
+    def blob(self, name, chunk_size=None):
+        blob = FakeBlob(name, chunk_size)
+        self.blobs.append(blob)
+        return blob
+
+
+class FakeClient:
+    def __init__(self):
+        self.fake_bucket = FakeBucket()
+
+    def bucket(self, name):
+        return self.fake_bucket
+
+
+def make_pdfs(directory, names):
+    os.makedirs(directory, exist_ok=True)
+    for name in names:
+        with open(os.path.join(directory, name), "wb") as f:
+            f.write(f"%PDF-1.4 {name}".encode())
+
+
+def test_bulk_upload_skips_unchanged_files(tmp_path):
+    source = tmp_path / "source"
+    make_pdfs(source, ["heavy_bleeding.pdf", "cycle-length.pdf"])
+    backend = upload_pdfs.FilesystemBackend(tmp_path / "bucket")
+    manifest_path = str(tmp_path / "manifest.json")
+    files = upload_pdfs.collect_files(str(source))
+
+    results = upload_pdfs.bulk_upload(backend, files, upload_pdfs.UploadManifest(manifest_path, backend.identity), workers=2)
+    assert results == {"uploaded": 2, "skipped": 0, "failed": 0}
+    assert backend.remote_md5("pdfs/heavy_bleeding.pdf") == upload_pdfs.compute_md5(str(source / "heavy_bleeding.pdf"))
+
+    # A fresh run resumes from the manifest
+    results = upload_pdfs.bulk_upload(backend, files, upload_pdfs.UploadManifest(manifest_path, backend.identity), workers=2)
+    assert results == {"uploaded": 0, "skipped": 2, "failed": 0}
+
+    # Without a manifest, unchanged objects are detected from the stored hashes
+    results = upload_pdfs.bulk_upload(backend, files, upload_pdfs.UploadManifest(str(tmp_path / "new.json"), backend.identity), workers=2)
+    assert results == {"uploaded": 0, "skipped": 2, "failed": 0}
+
+
+def test_manifest_is_scoped_to_backend(tmp_path):
+    source = tmp_path / "source"
+    make_pdfs(source, ["a.pdf"])
+    manifest_path = str(tmp_path / "manifest.json")
+    files = upload_pdfs.collect_files(str(source))
+
+    dry = upload_pdfs.FilesystemBackend(tmp_path / "dry")
+    upload_pdfs.bulk_upload(dry, files, upload_pdfs.UploadManifest(manifest_path, dry.identity))
+
+    real = upload_pdfs.FilesystemBackend(tmp_path / "real")
+    manifest = upload_pdfs.UploadManifest(manifest_path, real.identity)
+    results = upload_pdfs.bulk_upload(real, files, manifest)
+    assert results == {"uploaded": 1, "skipped": 0, "failed": 0}
+    assert (tmp_path / "real" / "pdfs" / "a.pdf").exists()
+    assert manifest.unregistered() == ["pdfs/a.pdf"]
+
+
+def test_register_content_in_batches(tmp_path):
+    source = tmp_path / "source"
+    make_pdfs(source, ["a.pdf", "b.pdf", "c.pdf"])
+    backend = upload_pdfs.FilesystemBackend(tmp_path / "bucket")
+    manifest = upload_pdfs.UploadManifest(str(tmp_path / "manifest.json"), backend.identity)
+    upload_pdfs.bulk_upload(backend, upload_pdfs.collect_files(str(source)), manifest)
+
+    connector = FakeConnector()
+    assert upload_pdfs.register_content(connector, backend, manifest, "ACOG", batch_size=2) == 3
+    assert [len(rows) for _, _, rows in connector.batches] == [2, 1]
+    assert connector.batches[0][2][0]["title"] == "A"
+    assert upload_pdfs.register_content(connector, backend, manifest, "ACOG") == 0
+
+
+def test_gcs_backend_chunks_large_files_and_skips_matching_hashes(tmp_path):
+    source = tmp_path / "source"
+    make_pdfs(source, ["small.pdf", "unchanged.pdf"])
+    with open(source / "large.pdf", "wb") as f:
+        f.truncate(upload_pdfs.RESUMABLE_THRESHOLD + 1)
+
+    client = FakeClient()
+    bucket = client.fake_bucket
+    bucket.stored["pdfs/unchanged.pdf"] = FakeBlob(
+        "pdfs/unchanged.pdf", md5_hash=upload_pdfs.compute_md5(str(source / "unchanged.pdf"))
+    )
+    backend = upload_pdfs.GCSBackend("guidelines", client=client)
+    manifest = upload_pdfs.UploadManifest(str(tmp_path / "manifest.json"), backend.identity)
+
+    results = upload_pdfs.bulk_upload(backend, upload_pdfs.collect_files(str(source)), manifest)
+    assert results == {"uploaded": 2, "skipped": 1, "failed": 0}
+
+    blobs = {blob.name: blob for blob in bucket.blobs}
+    assert sorted(blobs) == ["pdfs/large.pdf", "pdfs/small.pdf"]
+    assert blobs["pdfs/large.pdf"].chunk_size == upload_pdfs.CHUNK_SIZE
+    assert blobs["pdfs/small.pdf"].chunk_size is None
+    for blob in blobs.values():
+        assert blob.uploads[0][1] == "application/pdf"
+    assert bucket.stored["pdfs/unchanged.pdf"].uploads == []
@@ -0,0 +1,48 @@
+import os
+import sys
+import argparse
+
+# Add the server directory to PYTHONPATH for easier imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.diagnosis_table import (
+    DEFAULT_TABLE_PATH,
+    DiagnosisTable,
+    build_diagnosis_table,
+    verify_diagnosis_table,
+)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build or verify the precomputed diagnosis lookup table.")
+    parser.add_argument("command", choices=["build", "verify"])
+    parser.add_argument("--path", default=DEFAULT_TABLE_PATH, help="Table file to write or verify.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == "build":
+        table = build_diagnosis_table()
+        table.save(args.path)
+        outcomes = ", ".join(f"{name}: {len(table.outcomes[name])}" for name in sorted(table.outcomes))
+        print(f"Wrote {table.size} entries per table to {args.path} (distinct outcomes {outcomes}).")
+        return 0
+
+    try:
+        table = DiagnosisTable.load(args.path)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Could not load diagnosis table: {e}. Run build first.")
+        return 1
+    mismatches = verify_diagnosis_table(table)
+    for name, cycle_length, cycle_duration, symptoms, expected, actual in mismatches[:20]:
+        print(f"{name}({cycle_length}, {cycle_duration}, {symptoms}): expected {expected}, got {actual}")
+    if mismatches:
+        print(f"{len(mismatches)} mismatches found. Rebuild the table.")
+        return 1
+    print("Diagnosis table matches the live rules.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,23 +1,284 @@
 import os
-from google.cloud import storage
+import sys
+import json
+import base64
+import shutil
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-def upload_to_gcs(bucket_name, source_file_name, destination_blob_name):
-    """Uploads a file to the GCS bucket."""
-    storage_client = storage.Client()
-    bucket = storage_client.bucket(bucket_name)
-    blob = bucket.blob(destination_blob_name)
+# Add the server directory to PYTHONPATH for easier imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-    blob.upload_from_filename(source_file_name)
-    print(f"File {source_file_name} uploaded to {destination_blob_name}.")
+# GCS requires resumable upload chunks to be a multiple of 256 KiB
+CHUNK_SIZE = 8 * 1024 * 1024
+RESUMABLE_THRESHOLD = 8 * 1024 * 1024
+MANIFEST_NAME = ".upload_manifest.json"
 
-if __name__ == "__main__":
-    os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = "path/to/your-service-account.json"
 
-    bucket_name = "your-bucket-name"
-    files = [
-        {"local": "path/to/pdf1.pdf", "remote": "pdfs/pdf1.pdf"},
-        {"local": "path/to/pdf2.pdf", "remote": "pdfs/pdf2.pdf"},
-    ]
+def compute_md5(path):
+    """
+    Compute the base64-encoded MD5 digest of a local file, in the same
+    format GCS reports for `Blob.md5_hash`.
+    """
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return base64.b64encode(digest.digest()).decode("ascii")
+
+
+class GCSBackend:
+    """
+    Upload target backed by a Google Cloud Storage bucket.
+    A single client is shared by all workers. Set STORAGE_EMULATOR_HOST to
+    run against a local GCS emulator.
+    """
+
+    def __init__(self, bucket_name, client=None):
+        if client is None:
+            from google.cloud import storage
+
+            client = storage.Client()
+        self.bucket_name = bucket_name
+        self.identity = f"gs://{bucket_name}"
+        self.client = client
+        self.bucket = self.client.bucket(bucket_name)
+
+    def remote_md5(self, remote_name):
+        """
+        Return the stored MD5 hash of an object, or None if it does not exist.
+        """
+        blob = self.bucket.get_blob(remote_name)
+        return blob.md5_hash if blob else None
+
+    def upload(self, local_path, remote_name):
+        """
+        Upload a file, using chunked resumable uploads for large files.
+        """
+        size = os.path.getsize(local_path)
+        chunk_size = CHUNK_SIZE if size > RESUMABLE_THRESHOLD else None
+        blob = self.bucket.blob(remote_name, chunk_size=chunk_size)
+        blob.upload_from_filename(local_path, content_type="application/pdf")
+
+    def url(self, remote_name):
+        return f"https://storage.googleapis.com/{self.bucket_name}/{remote_name}"
+
+
+class FilesystemBackend:
+    """
+    Upload target backed by a local directory. Useful for tests and dry runs.
+    """
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.identity = "file://" + self.root
+
+    def _path(self, remote_name):
+        return os.path.join(self.root, *remote_name.split("/"))
+
+    def remote_md5(self, remote_name):
+        path = self._path(remote_name)
+        return compute_md5(path) if os.path.exists(path) else None
+
+    def upload(self, local_path, remote_name):
+        path = self._path(remote_name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.part"
+        shutil.copyfile(local_path, tmp_path)
+        os.replace(tmp_path, path)
+
+    def url(self, remote_name):
+        return "file://" + self._path(remote_name)
+
+
+class UploadManifest:
+    """
+    Local record of uploaded objects, so interrupted runs can resume.
+    Entries are kept per backend identity and map each remote name to its
+    MD5 hash and whether it has been registered in the graph.
+    """
+
+    def __init__(self, path, backend_identity):
+        self.path = path
+        self._lock = threading.Lock()
+        self.backends = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.backends = json.load(f)
+        self.entries = self.backends.setdefault(backend_identity, {})
+
+    def is_current(self, remote_name, md5):
+        with self._lock:
+            entry = self.entries.get(remote_name)
+            return entry is not None and entry["md5"] == md5
+
+    def record_upload(self, remote_name, md5):
+        with self._lock:
+            self.entries[remote_name] = {"md5": md5, "registered": False}
+            self._save()
+
+    def unregistered(self):
+        with self._lock:
+            return sorted(name for name, entry in self.entries.items() if not entry["registered"])
+
+    def mark_registered(self, remote_names):
+        with self._lock:
+            for name in remote_names:
+                self.entries[name]["registered"] = True
+            self._save()
+
+    def _save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.backends, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
 
-    for file in files:
-        upload_to_gcs(bucket_name, file["local"], file["remote"])
+def collect_files(source_dir, prefix="pdfs/"):
+    """
+    Find all PDFs under a directory and map them to remote object names.
+    """
+    files = []
+    for dirpath, _, filenames in os.walk(source_dir):
+        for filename in sorted(filenames):
+            if not filename.lower().endswith(".pdf"):
+                continue
+            local = os.path.join(dirpath, filename)
+            relative = os.path.relpath(local, source_dir).replace(os.sep, "/")
+            files.append({"local": local, "remote": prefix + relative})
+    return sorted(files, key=lambda f: f["remote"])
+
+
+def upload_file(backend, manifest, file):
+    """
+    Upload a single file unless the manifest or the stored object hash shows
+    it is unchanged.
+
+    Returns:
+    - str: "uploaded" or "skipped".
+    """
+    md5 = compute_md5(file["local"])
+    if manifest.is_current(file["remote"], md5):
+        return "skipped"
+
+    status = "skipped"
+    if backend.remote_md5(file["remote"]) != md5:
+        backend.upload(file["local"], file["remote"])
+        status = "uploaded"
+    manifest.record_upload(file["remote"], md5)
+    return status
+
+
+def bulk_upload(backend, files, manifest, workers=8):
+    """
+    Upload files concurrently with a bounded worker pool.
+
+    Returns:
+    - dict: Counts of uploaded, skipped and failed files.
+    """
+    results = {"uploaded": 0, "skipped": 0, "failed": 0}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(upload_file, backend, manifest, file): file for file in files}
+        for future in as_completed(futures):
+            file = futures[future]
+            try:
+                status = future.result()
+            except Exception as e:
+                print(f"Failed to upload {file['local']}: {e}")
+                results["failed"] += 1
+                continue
+            if status == "uploaded":
+                print(f"File {file['local']} uploaded to {file['remote']}.")
+            else:
+                print(f"File {file['local']} skipped (unchanged).")
+            results[status] += 1
+    return results
+
+
+def title_from_name(remote_name):
+    stem = os.path.splitext(os.path.basename(remote_name))[0]
+    return stem.replace("_", " ").replace("-", " ").strip().title()
+
+
+def register_content(connector, backend, manifest, source, batch_size=100):
+    """
+    Register uploaded documents as EducationalContent nodes, in batches.
+
+    Returns:
+    - int: Number of documents registered.
+    """
+    pending = manifest.unregistered()
+    for start in range(0, len(pending), batch_size):
+        batch = pending[start:start + batch_size]
+        rows = [
+            {
+                "type": "pdf",
+                "url": backend.url(name),
+                "title": title_from_name(name),
+                "source": source,
+            }
+            for name in batch
+        ]
+        connector.merge_nodes("EducationalContent", "url", rows)
+        manifest.mark_registered(batch)
+    return len(pending)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk upload guideline PDFs and register them in the graph.")
+    parser.add_argument("source_dir", help="Directory containing the PDFs to upload.")
+    parser.add_argument("--bucket", help="GCS bucket name (required for the gcs backend).")
+    parser.add_argument("--backend", choices=["gcs", "filesystem"], default="gcs")
+    parser.add_argument("--target-dir", help="Destination directory for the filesystem backend.")
+    parser.add_argument("--prefix", default="pdfs/", help="Remote object name prefix.")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--manifest", help=f"Manifest path (default: <source_dir>/{MANIFEST_NAME}).")
+    parser.add_argument("--source", default="ACOG", help="Source recorded on EducationalContent nodes.")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument(
+        "--register", dest="register", action="store_true",
+        help="Register documents in the graph (default: on for gcs, off for filesystem)."
+    )
+    parser.add_argument("--no-register", dest="register", action="store_false", help="Skip registering documents in the graph.")
+    parser.set_defaults(register=None)
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.backend == "gcs" and not args.bucket:
+        parser.error("--bucket is required for the gcs backend")
+    if args.backend == "filesystem" and not args.target_dir:
+        parser.error("--target-dir is required for the filesystem backend")
+    if args.register is None:
+        args.register = args.backend == "gcs"
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.backend == "gcs":
+        backend = GCSBackend(args.bucket)
+    else:
+        backend = FilesystemBackend(args.target_dir)
+
+    manifest = UploadManifest(args.manifest or os.path.join(args.source_dir, MANIFEST_NAME), backend.identity)
+    files = collect_files(args.source_dir, args.prefix)
+    results = bulk_upload(backend, files, manifest, workers=args.workers)
+    print(f"Uploaded {results['uploaded']}, skipped {results['skipped']}, failed {results['failed']}.")
+
+    if args.register:
+        from app.db.neo4j_connector import Neo4jConnector
+
+        connector = Neo4jConnector()
+        try:
+            registered = register_content(connector, backend, manifest, args.source, args.batch_size)
+        finally:
+            connector.close()
+        print(f"Registered {registered} documents as EducationalContent.")
+
+    return 1 if results["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())